@@ -124,6 +124,15 @@ def main():
 
 
 def run_app():
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        # インストールされている場合は uvloop のイベントループを使う
+        import asyncio
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     ignored_modules = list(m for m in sys.modules.keys() if not m.startswith("dncore"))
 
     while True:
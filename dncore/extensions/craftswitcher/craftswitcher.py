@@ -3,14 +3,16 @@ import datetime
 import mimetypes
 import os
 import shutil
+import stat
 import time
 from collections import defaultdict
 from logging import getLogger
 from pathlib import Path
-from typing import Coroutine, TYPE_CHECKING, Any
+from typing import Coroutine, TYPE_CHECKING, Any, Iterable
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from dncore.event import EventListener, onevent
 from . import utilscreen as screen
@@ -33,6 +35,7 @@ from .publicapi.server import FallbackStaticFiles
 from .repomov1 import ReportModuleServer
 from .serverprocess import ServerProcessList, ServerProcess
 from .utiljava import JavaPreset, check_java_executable
+from .utilprocess import setup_child_watcher
 from .utils import *
 
 if TYPE_CHECKING:
@@ -80,6 +83,7 @@ class CraftSwitcher(EventListener):
         self._directory_changed_servers = set()  # type: set[str]  # 停止後にディレクトリを更新するサーバー
         self._remove_servers = set()  # type: set[str]  # 停止後に削除するサーバー
         self._watch_files = defaultdict(set)  # type: dict[Path, set[FileWatchInfo]]
+        self._server_swipaths = {}  # type: dict[tuple[Path, Path], str | None]  # (serverDir, rootDir) -> SWIパス
         self._scan_java_task = None  # type: asyncio.Task | None
         #
         self._files_task_broadcast_loop = AsyncCallTimer(self._files_task_broadcast_loop, .5, .5)
@@ -127,6 +131,9 @@ class CraftSwitcher(EventListener):
         self._initialized = True
         CraftSwitcher._inst = self
 
+        # サーバーやビルダーを起動する前に、子プロセスの終了待ちを pidfd に切り替える
+        setup_child_watcher(self.loop)
+
         self.load_config()
         self.load_servers()
 
@@ -554,6 +561,7 @@ class CraftSwitcher(EventListener):
         api = FastAPI(
             title="CraftSwitcher",
             version=__version__,
+            default_response_class=ORJSONResponse,
         )
         api.add_middleware(
             CORSMiddleware,
@@ -584,39 +592,111 @@ class CraftSwitcher(EventListener):
         """
         指定されたパスの :class:`FileInfo` を返します
         """
-        stats = realpath.stat()
+        return self.create_file_info_from_stat(realpath, realpath.stat(), root_dir=root_dir)
 
+    def create_file_info_from_stat(self, realpath: Path, stats: os.stat_result, *, root_dir: Path = None):
+        """
+        取得済みの stat 情報を使い、指定されたパスの :class:`FileInfo` を返します
+        """
         swipath = self.files.swipath(realpath, force=True, root_dir=root_dir)
         swipath_by_root = self.files.swipath(realpath, force=True) if root_dir else swipath
-        try:
-            match_server_id = None
-            for _server_id, _server_dir in self.config.servers.items():
-                if _server_dir == swipath_by_root:
-                    match_server_id = _server_id
-                    break
-        except KeyError:
-            match_server_id = None
+        match_server_id = self._find_server_id_by_swipath(swipath_by_root)
 
-        is_server_dir = realpath.is_dir() and (realpath / self.SERVER_CONFIG_FILE_NAME).is_file()
+        is_dir = stat.S_ISDIR(stats.st_mode)
+        is_server_dir = is_dir and (realpath / self.SERVER_CONFIG_FILE_NAME).is_file()
 
-        return FileInfo(
+        return FileInfo.model_construct(
             name="" if swipath == "/" else realpath.name,
             path=self.files.swipath(realpath.parent, force=True, root_dir=root_dir),
-            is_dir=realpath.is_dir(),
-            size=stats.st_size if realpath.is_file() else -1,
+            is_dir=is_dir,
+            size=stats.st_size if stat.S_ISREG(stats.st_mode) else -1,
             modify_time=int(stats.st_mtime),
             create_time=int(stats.st_ctime),
             is_server_dir=is_server_dir,
             registered_server_id=match_server_id,
         )
 
+    def create_file_infos(self, entries: "Iterable[os.DirEntry]", parent_realpath: Path, parent_swipath: str,
+                          *, parent_swipath_by_root: str | None) -> list[FileInfo]:
+        """
+        ディレクトリ内のエントリから :class:`FileInfo` のリストを返します
+
+        ファイルごとのパス解決や登録サーバーの検索を省略し、まとめて作成します。
+        登録サーバーは親ディレクトリのパスとエントリ名から検索するため、シンボリックリンクの参照先は考慮しません。
+        情報を取得できないエントリは警告を出して除外します。
+
+        :arg entries: :func:`os.scandir` で取得したエントリ
+        :arg parent_realpath: 親ディレクトリのシステムパス
+        :arg parent_swipath: 親ディレクトリのSWIパス
+        :arg parent_swipath_by_root: rootDirを基準にした親ディレクトリのSWIパス。rootDir外の時は None を指定し、登録サーバーを検索しません。
+        """
+        if parent_swipath_by_root is None:
+            root_prefix = None
+            server_ids = {}
+        else:
+            root_prefix = parent_swipath_by_root.rstrip("/") + "/"
+            # 重複時は先に登録されたサーバーを優先する
+            server_ids = {_dir: _id for _id, _dir in reversed(self.config.servers.items())}
+        config_name = self.SERVER_CONFIG_FILE_NAME
+        construct = FileInfo.model_construct
+        s_isdir, s_isreg = stat.S_ISDIR, stat.S_ISREG
+        isfile, join = os.path.isfile, os.path.join
+
+        infos = []  # type: list[FileInfo]
+        for entry in entries:
+            name = entry.name
+            try:
+                stats = entry.stat()
+                is_dir = s_isdir(stats.st_mode)
+                infos.append(construct(
+                    name=name,
+                    path=parent_swipath,
+                    is_dir=is_dir,
+                    size=stats.st_size if s_isreg(stats.st_mode) else -1,
+                    modify_time=int(stats.st_mtime),
+                    create_time=int(stats.st_ctime),
+                    is_server_dir=is_dir and isfile(join(parent_realpath, name, config_name)),
+                    registered_server_id=None if root_prefix is None else server_ids.get(root_prefix + name),
+                ))
+            except Exception as e:
+                log.warning("Failed to get file info: %s: %s", entry.path, str(e))
+        return infos
+
+    def _find_server_id_by_swipath(self, swipath: str) -> str | None:
+        for _server_id, _server_dir in self.config.servers.items():
+            if _server_dir == swipath:
+                return _server_id
+        return None
+
     def swipath_server(self, server: ServerProcess):
         """
         指定されたサーバーのSWIパスを返します
 
         rootDirが変更されているか、rootDir元に属さないサーバーである場合は :class:`ValueError` を発生させます
         """
-        return self.files.swipath(server.directory)
+        swipath = self.try_swipath_server(server)
+        if swipath is None:
+            raise ValueError("Not allowed path")
+        return swipath
+
+    def try_swipath_server(self, server: ServerProcess) -> str | None:
+        """
+        指定されたサーバーのSWIパスを返します
+
+        rootDirが変更されているか、rootDir元に属さないサーバーである場合は None を返します
+        """
+        key = server.resolved_directory, self.files.root_dir
+        try:
+            return self._server_swipaths[key]
+        except KeyError:
+            pass
+
+        try:
+            swipath = self.files.swipath(server.resolved_directory)
+        except ValueError:
+            swipath = None
+        self._server_swipaths[key] = swipath
+        return swipath
 
     def get_ws_clients_by_watchdog_event(self, event: WatchdogEvent):
         clients = set()
@@ -911,6 +991,7 @@ class CraftSwitcher(EventListener):
         self.config.save()
 
     def _remove_server(self, server_id: str):
+        self._server_swipaths.clear()
         self._directory_changed_servers.discard(server_id)
         self._remove_servers.discard(server_id)
         self.servers.pop(server_id, None)
@@ -994,27 +1075,30 @@ class CraftSwitcher(EventListener):
 
         total = report and report.total_memory
         free = report and report.free_memory
+        total = None if total is None else int(total)
+        free = None if free is None else int(free)
 
-        return ServerStatusInfo(
+        # エージェントからの値はここで型を揃えるため、モデルの検証は省略する
+        return ServerStatusInfo.model_construct(
             id=server.id,
-            process=ServerStatusInfo.Process(
-                cpu_usage=p_info.cpu_usage,
+            process=ServerStatusInfo.Process.model_construct(
+                cpu_usage=float(p_info.cpu_usage),
                 mem_used=p_info.memory_used_size,
                 mem_virtual_used=p_info.memory_virtual_used_size,
             ) if (p_info := server.get_perf_info()) else None,
-            jvm=ServerStatusInfo.JVM(
-                cpu_usage=None if (val := report.cpu_usage) is None else val * 100,
+            jvm=ServerStatusInfo.JVM.model_construct(
+                cpu_usage=None if (val := report.cpu_usage) is None else float(val) * 100,
                 mem_used=None if total is None or free is None else total - free,
-                mem_total=None if total is None else total,
+                mem_total=total,
             ) if report else None,
-            game=ServerStatusInfo.Game(
-                ticks=None if (val := report.tps) is None else val,
-                max_players=None if (val := report.max_players) is None else val,
+            game=ServerStatusInfo.Game.model_construct(
+                ticks=None if (val := report.tps) is None else float(val),
+                max_players=None if (val := report.max_players) is None else int(val),
                 online_players=None if (val := report.players) is None else len(val),
                 players=None if report.players is None else [
-                    ServerStatusInfo.Game.Player(
+                    ServerStatusInfo.Game.Player.model_construct(
                         uuid=str(p_uuid),
-                        name=p_name,
+                        name=str(p_name),
                     ) for p_uuid, p_name in report.players.items()
                 ],
             ) if report else None,
@@ -2,6 +2,7 @@ import asyncio
 import concurrent.futures
 import datetime
 import os.path
+import threading
 import zipfile
 from pathlib import Path
 from typing import AsyncGenerator, Any, AsyncIterable
@@ -99,7 +100,7 @@ class ZipArchiveHelper(ArchiveHelper):
             with zipfile.ZipFile(archive_path, "w") as fz:
                 for child in files:
                     fz.write(child, self._safe_path(root_dir, child))
-                    completed.put_nowait(child)
+                    loop.call_soon_threadsafe(completed.put_nowait, child)
 
         fut = loop.run_in_executor(self.executor, _in_thread)
 
@@ -118,6 +119,7 @@ class ZipArchiveHelper(ArchiveHelper):
     async def extract_archive(self, archive_path: Path, extract_dir: Path, password: str = None,
                               ) -> AsyncGenerator[ArchiveProgress, None]:
         _args = [None]  # type: list[Any]
+        loop = asyncio.get_running_loop()
         completed = asyncio.Queue()
 
         def _in_thread():
@@ -130,9 +132,9 @@ class ZipArchiveHelper(ArchiveHelper):
 
                 for count, child in enumerate(files):
                     fz.extract(child, extract_dir)
-                    completed.put_nowait(child)
+                    loop.call_soon_threadsafe(completed.put_nowait, child)
 
-        fut = asyncio.get_running_loop().run_in_executor(self.executor, _in_thread)
+        fut = loop.run_in_executor(self.executor, _in_thread)
 
         completed_count = 0
         while not fut.done() or not completed.empty():
@@ -155,30 +157,36 @@ class ZipArchiveHelper(ArchiveHelper):
                                     *, chunk_size=1024 * 8) -> AsyncIterable[bytes]:
         q = asyncio.Queue(maxsize=8)
         loop = asyncio.get_running_loop()
-        interrupt = asyncio.Event()
+        interrupt = threading.Event()
 
         def _reader():
-            with zipfile.ZipFile(archive_path, "r") as fz:
-                if password is not None:
-                    fz.setpassword(password.encode("utf-8"))
-
-                files = fz.namelist()
-                if filename not in files:
-                    raise FileNotFoundError(filename)
-
-                with fz.open(filename, "r") as f:
-                    while (chunk := f.read(chunk_size)) and not interrupt.is_set():
-                        asyncio.run_coroutine_threadsafe(q.put(chunk), loop)
+            try:
+                with zipfile.ZipFile(archive_path, "r") as fz:
+                    if password is not None:
+                        fz.setpassword(password.encode("utf-8"))
+
+                    files = fz.namelist()
+                    if filename not in files:
+                        raise FileNotFoundError(filename)
+
+                    with fz.open(filename, "r") as f:
+                        while not interrupt.is_set() and (chunk := f.read(chunk_size)):
+                            # キューが空くまで待つ
+                            asyncio.run_coroutine_threadsafe(q.put(chunk), loop).result()
+            finally:
                 asyncio.run_coroutine_threadsafe(q.put(None), loop)
 
-        task = loop.run_in_executor(None, _reader())
+        task = loop.run_in_executor(self.executor, _reader)
 
         try:
-            while _chunk := await q.get():
+            while (_chunk := await q.get()) is not None:
                 yield _chunk
+            await task
+
         finally:
             interrupt.set()
-            task.cancel()
+            while not q.empty():  # 待機中の読み取りスレッドを解放する
+                q.get_nowait()
             try:
                 await task
             except (Exception,):
@@ -24,6 +24,7 @@ if TYPE_CHECKING:
     from dncore.extensions.craftswitcher import ServerProcess
 
 log = getLogger(__name__)
+_ABSOLUTE_PREFIX = re.compile(r"^([a-zA-Z]:/*|/+)")
 
 
 class WatchdogEventHandler(FileSystemEventHandler):
@@ -152,12 +153,11 @@ class FileManager(object):
         :arg swi_path: SWIパス
         :arg force: 例外を出さずに安全に処理します
         """
-        regex = re.compile(r"^([a-zA-Z]:/*|/+)")
         swi_path = swi_path.replace("\\", "/")
-        match = regex.match(swi_path)
+        match = _ABSOLUTE_PREFIX.match(swi_path)
         while match:  # 絶対パス(C:\\や/)を除外する
             swi_path = swi_path[match.end():]
-            match = regex.match(swi_path)
+            match = _ABSOLUTE_PREFIX.match(swi_path)
 
         new_parts = []
         for part in swi_path.split("/"):
@@ -236,12 +236,15 @@ class FileManager(object):
              server: "ServerProcess" = None, src_swi_path: str = None, dst_swi_path: str = None, ):
         """
         ファイルをコピーするタスクを作成し、実行します。
+
+        タスクの結果はコピー先の stat 情報です。
         """
         def _do():
             if src.is_dir():
                 shutil.copytree(src, dst)
             else:
                 shutil.copyfile(src, dst)
+            return os.stat(dst)
 
         return self.create_task_in_executor(
             FileEventType.COPY, src, dst, _do, executor=None,
@@ -251,10 +254,13 @@ class FileManager(object):
     def move(self, src: Path, dst: Path,
              server: "ServerProcess" = None, src_swi_path: str = None, dst_swi_path: str = None, ):
         """
-        ファイルをコピーするタスクを作成し、実行します。
+        ファイルを移動するタスクを作成し、実行します。
+
+        タスクの結果は移動先の stat 情報です。
         """
         def _do():
             shutil.move(src, dst)
+            return os.stat(dst)
 
         return self.create_task_in_executor(
             FileEventType.MOVE, src, dst, _do, executor=None,
@@ -298,12 +304,13 @@ class FileManager(object):
 
     async def mkdir(self, src: Path, parents=False):
         """
-        ディレクトリを作成します
+        ディレクトリを作成し、その stat 情報を返します
         """
         def _do():
             src.mkdir(parents=parents)
+            return os.stat(src)
 
-        await self.loop.run_in_executor(None, _do)
+        return await self.loop.run_in_executor(None, _do)
 
     @staticmethod
     async def fetch_download_filename(url: str):
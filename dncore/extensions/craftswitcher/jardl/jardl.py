@@ -136,9 +136,11 @@ class ServerMCVersion(Generic[SB]):
     def __init__(self, mc_version: str, builds: "list[SF] | None"):
         self.mc_version = mc_version
         self.builds = builds
+        self._builds_map = None  # type: tuple[list[SB], dict[str, SB]] | None
 
     def clear_cache(self):
         self.builds = None
+        self._builds_map = None
 
     async def _list_builds(self) -> list[SB]:
         raise NotImplementedError
@@ -148,6 +150,18 @@ class ServerMCVersion(Generic[SB]):
             self.builds = (await self._list_builds()) or []
         return self.builds
 
+    async def get_build(self, build: str) -> SB | None:
+        """
+        ビルド名からビルドを返します
+
+        一覧から作成した辞書をキャッシュし、一覧が更新されるまで再利用します
+        """
+        builds = await self.list_builds()
+        if self._builds_map is None or self._builds_map[0] is not builds:
+            # 重複時は一覧の先頭を優先する
+            self._builds_map = builds, {b.build: b for b in reversed(builds)}
+        return self._builds_map[1].get(build)
+
 
 SV = TypeVar("SV", bound=ServerMCVersion)
 
@@ -155,9 +169,11 @@ SV = TypeVar("SV", bound=ServerMCVersion)
 class ServerDownloader(Generic[SV]):
     def __init__(self):
         self.versions = None  # type: list[SV] | None
+        self._versions_map = None  # type: tuple[list[SV], dict[str, SV]] | None
 
     def clear_cache(self):
         self.versions = None
+        self._versions_map = None
 
     async def _list_versions(self) -> list[SV]:
         raise NotImplementedError
@@ -167,6 +183,18 @@ class ServerDownloader(Generic[SV]):
             self.versions = (await self._list_versions()) or []
         return self.versions
 
+    async def get_version(self, mc_version: str) -> SV | None:
+        """
+        Minecraftバージョンからバージョンを返します
+
+        一覧から作成した辞書をキャッシュし、一覧が更新されるまで再利用します
+        """
+        versions = await self.list_versions()
+        if self._versions_map is None or self._versions_map[0] is not versions:
+            # 重複時は一覧の先頭を優先する
+            self._versions_map = versions, {v.mc_version: v for v in reversed(versions)}
+        return self._versions_map[1].get(mc_version)
+
 
 def defaults():
     from ..abc import ServerType
@@ -2,8 +2,9 @@ import asyncio
 from logging import getLogger
 from typing import TYPE_CHECKING, Iterable
 
+import orjson
 from fastapi import FastAPI, HTTPException, WebSocket
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from dncore.extensions.craftswitcher.files import FileManager
 from dncore.extensions.craftswitcher.publicapi import APIError, WebSocketClient
@@ -41,14 +42,14 @@ class APIHandler(object):
 
         @api.exception_handler(HTTPException)
         def _on_api_error(_, exc: HTTPException):
-            return JSONResponse(status_code=exc.status_code, content=dict(
+            return ORJSONResponse(status_code=exc.status_code, content=dict(
                 error=exc.detail,
                 error_code=exc.code if isinstance(exc, APIError) else -1,
             ))
 
         @api.exception_handler(500)
         def _on_internal_exception_handler(_, __: Exception):
-            return JSONResponse(status_code=500, content=dict(
+            return ORJSONResponse(status_code=500, content=dict(
                 error="Internal Server Error",
                 error_code=-1,
             ))
@@ -60,8 +61,10 @@ class APIHandler(object):
         return self._websocket_clients
 
     async def broadcast_websocket(self, data, *, clients: Iterable[WebSocketClient] = None):
+        # クライアントごとにエンコードせず、一度だけ変換したテキストを送る
+        text = orjson.dumps(data).decode("utf-8")
         tasks = [
-            client.websocket.send_json(data)
+            client.websocket.send_text(text)
             for client in (self.ws_clients if clients is None else clients)
         ]
 
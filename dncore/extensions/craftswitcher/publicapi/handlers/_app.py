@@ -1,10 +1,9 @@
 from logging import getLogger
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
 from fastapi import WebSocket, Depends, APIRouter
 from fastapi.params import Query
 
-from dncore.configuration.configuration import ConfigValues
 from dncore.extensions.craftswitcher.abc import ServerType
 from dncore.extensions.craftswitcher.publicapi import APIErrorCode, model
 from .common import *
@@ -28,16 +27,7 @@ no_auth_api = APIRouter(
     description="Switcherの設定を返します",
 )
 def _get_config() -> model.SwitcherConfig:
-    def toflat(keys: list[str], conf: "ConfigValues") -> dict[str, Any]:
-        ls = {}
-        for key, entry in conf.get_values().items():
-            if isinstance(entry.value, ConfigValues):
-                ls.update(toflat([*keys, key], entry.value))
-            else:
-                ls[".".join([*keys, key])] = entry.value
-        return ls
-
-    return model.SwitcherConfig(**toflat([], inst.config))
+    return model.SwitcherConfig(**flatten_config(inst.config))
 
 
 @api.put(
@@ -66,16 +56,7 @@ def _put_config(param: model.SwitcherConfig) -> model.SwitcherConfig:
     summary="サーバーのデフォルト設定の取得",
 )
 async def _get_config_server_global() -> model.ServerGlobalConfig:
-    def toflat(keys: list[str], conf: "ConfigValues") -> dict[str, Any]:
-        ls = {}
-        for key, entry in conf.get_values().items():
-            if isinstance(entry.value, ConfigValues):
-                ls.update(toflat([*keys, key], entry.value))
-            else:
-                ls[".".join([*keys, key])] = entry.value
-        return ls
-
-    return model.ServerGlobalConfig(**toflat([], inst.config.server_defaults))
+    return model.ServerGlobalConfig(**flatten_config(inst.config.server_defaults))
 
 
 @api.put(
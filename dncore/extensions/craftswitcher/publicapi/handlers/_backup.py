@@ -4,7 +4,8 @@ from uuid import UUID
 
 from fastapi import Depends, APIRouter
 from fastapi.params import Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+from pydantic import TypeAdapter
 from starlette.background import BackgroundTask
 
 from dncore.extensions.craftswitcher.database.model import SnapshotErrorFile
@@ -24,6 +25,7 @@ api = APIRouter(
     tags=["Backup", ],
     dependencies=[Depends(get_authorized_user), ],
 )
+_BACKUP_LIST_ADAPTER = TypeAdapter(list[model.Backup])
 
 
 async def get_backup_files(backup_id: UUID, check_files: bool) -> "FilesResult":
@@ -86,7 +88,7 @@ async def get_backup_files(backup_id: UUID, check_files: bool) -> "FilesResult":
 
 
 def convert_to_error_files_model(error_files: dict[str, tuple[BackupFileErrorType, SnapshotErrorFile | None]]):
-    return [model.BackupFilePathErrorInfo(
+    return [model.BackupFilePathErrorInfo.model_construct(
         path=p,
         error_type=e_type,
         error_message=e.error_message if e else None,
@@ -100,7 +102,8 @@ def create_backups_compare_result(
     files_diff = compare_files_diff(old_backup.files, new_backup.files)
     update_files_diff = [diff for diff in files_diff if 0 < diff.status.value]  # not DELETE or not NO_CHANGE
 
-    return model.BackupsCompareResult(
+    # 値は内部で集計したものなので検証を省略する
+    return model.BackupsCompareResult.model_construct(
         total_files=len(old_backup.files),
         total_files_size=old_backup.total_files_size,
         error_files=len(old_backup.error_files),
@@ -127,7 +130,8 @@ def create_backup_preview_result(
     files_diff = compare_files_diff(old_files, new_result.files)
     update_files_diff = [diff for diff in files_diff if 0 < diff.status.value]  # not DELETE or not NO_CHANGE
 
-    return model.BackupPreviewResult(
+    # 値は内部で集計したものなので検証を省略する
+    return model.BackupPreviewResult.model_construct(
         total_files=len(new_result.files),
         total_files_size=new_result.total_files_size,
         error_files=len(new_result.error_files),
@@ -157,7 +161,7 @@ async def get_server_files(server_dir: Path):
     return FilesResult(
         files=scan_files,
         total_files_size=_size[0],
-        error_files=[model.BackupFilePathErrorInfo(
+        error_files=[model.BackupFilePathErrorInfo.model_construct(
                 path=p,
                 error_type=BackupFileErrorType.SCAN,
                 error_message=str(e),
@@ -286,6 +290,7 @@ async def _get_backup_file(backup_id: UUID, path: str):
 
 @api.get(
     "/backup/{backup_id}/files",
+    response_model=model.BackupFilesResult,
     summary="ファイル一覧",
     description=(
             "バックアップされたファイルを一覧します"
@@ -296,9 +301,9 @@ async def _files_backup(
     check_files: bool = Query(False, description="常に実際のファイルをチェックします"),
     include_files: bool = Query(False, description="バックアップ対象のファイル情報を返す"),
     include_errors: bool = Query(False, description="エラーファイルを返す"),
-) -> model.BackupFilesResult:
+) -> Response:
     r = await get_backup_files(backup_id, check_files)
-    return model.BackupFilesResult(
+    result = model.BackupFilesResult.model_construct(
         total_files=len(r.files),
         total_files_size=r.total_files_size,
         error_files=len(r.error_files),
@@ -307,10 +312,13 @@ async def _files_backup(
                for p, i in r.files.items()] if include_files else None,
         errors=r.error_files if include_errors else None,
     )
+    # ファイル数が多くなるため、レスポンスモデルでの再検証を通さずに直接 JSON に変換する
+    return Response(result.model_dump_json(), media_type="application/json")
 
 
 @api.get(
     "/backup/{backup_id}/files/compare",
+    response_model=model.BackupsCompareResult,
     summary="バックアップファイルの比較",
     description=(
             "`backup_id` に含まれないファイルを新規ファイルとしてマークします"
@@ -322,13 +330,14 @@ async def _files_compare_backups(
     include_files: bool = Query(False, description="バックアップ対象のファイル情報を返す"),
     include_errors: bool = Query(False, description="エラーファイルを返す"),
     only_updates: bool = Query(True, description="異なるファイルのみ `files` に含める"),
-) -> model.BackupsCompareResult:
+) -> Response:
     source_backup = await get_backup_files(backup_id, check_files)
     target_backup = await get_backup_files(target_backup_id, check_files)
-    return create_backups_compare_result(
+    result = create_backups_compare_result(
         source_backup, target_backup,
         include_files=include_files, include_errors=include_errors, only_updates=only_updates,
     )
+    return Response(result.model_dump_json(), media_type="application/json")
 
 
 @api.get(
@@ -351,13 +360,16 @@ async def _pack_server_backup(
 
 @api.get(
     "/server/{server_id}/backups",
+    response_model=list[model.Backup],
     summary="バックアップ一覧",
 )
-async def _get_server_backups(server: "ServerProcess" = Depends(getserver)) -> list[model.Backup]:
-    return [
+async def _get_server_backups(server: "ServerProcess" = Depends(getserver)) -> Response:
+    ls = [
         model.Backup.create(b)
         for b in await db.get_backups_or_snapshots(UUID(server.get_source_id()))
     ]
+    # 件数が多くなるため、レスポンスモデルでの再検証を通さずに直接 JSON に変換する
+    return Response(_BACKUP_LIST_ADAPTER.dump_json(ls), media_type="application/json")
 
 
 @api.get(
@@ -392,6 +404,7 @@ async def _post_server_backup(
 
 @api.get(
     "/server/{server_id}/backup/preview",
+    response_model=model.BackupPreviewResult,
     summary="バックアップのプレビュー",
     description="`snapshot` が true の場合は、リンク可能な最終スナップショットをチェック/比較します。",
 )
@@ -402,7 +415,7 @@ async def _preview_server_backup(
     include_files: bool = Query(False, description="バックアップ対象のファイル情報を返す"),
     include_errors: bool = Query(False, description="エラーファイルを返す"),
     only_updates: bool = Query(True, description="異なるファイルのみ `files` に含める"),
-) -> model.BackupPreviewResult:
+) -> Response:
     source_id = server.get_source_id()
     old_result = last_snapshot = None
 
@@ -415,10 +428,11 @@ async def _preview_server_backup(
                 old_result = await get_backup_files(last_snapshot.id, check_files)
 
     result = await get_server_files(server.directory)
-    return create_backup_preview_result(
+    preview = create_backup_preview_result(
         old_result and old_result.files, result, last_snapshot and last_snapshot.id or None,
         include_files=include_files, include_errors=include_errors, only_updates=only_updates,
     )
+    return Response(preview.model_dump_json(), media_type="application/json")
 
 
 @api.post(
@@ -445,6 +459,7 @@ async def _restore_server_backup(
 
 @api.get(
     "/server/{server_id}/backup/{backup_id}/verify",
+    response_model=model.BackupsCompareResult,
     summary="バックアップの検証",
     description=(
             "バックアップデータとサーバーデータのファイルを比較します\n\n"
@@ -457,7 +472,7 @@ async def _verify_server_backup(
     include_files: bool = Query(False, description="バックアップ対象のファイル情報を返す"),
     include_errors: bool = Query(False, description="エラーファイルを返す"),
     only_updates: bool = Query(True, description="異なるファイルのみ `files` に含める"),
-) -> model.BackupsCompareResult:
+) -> Response:
     return await _files_compare_server_backups(
         backup_id, server, True, include_files, include_errors, only_updates,
     )
@@ -465,6 +480,7 @@ async def _verify_server_backup(
 
 @api.get(
     "/server/{server_id}/backup/{backup_id}/files/compare",
+    response_model=model.BackupsCompareResult,
     summary="バックアップファイルの比較",
     description=(
             "バックアップとサーバーデータのファイルを比較します\n\n"
@@ -477,15 +493,16 @@ async def _files_compare_server_backups(
     include_files: bool = Query(False, description="バックアップ対象のファイル情報を返す"),
     include_errors: bool = Query(False, description="エラーファイルを返す"),
     only_updates: bool = Query(True, description="異なるファイルのみ `files` に含める"),
-) -> model.BackupsCompareResult:
+) -> Response:
     if not server.directory.is_dir():
         raise APIErrorCode.NOT_EXISTS_DIRECTORY.of("Not a directory or not exists")
     source_backup = await get_backup_files(backup_id, check_files)
     target_data = await get_server_files(server.directory)
-    return create_backups_compare_result(
+    result = create_backups_compare_result(
         source_backup, target_data,
         include_files=include_files, include_errors=include_errors, only_updates=only_updates,
     )
+    return Response(result.model_dump_json(), media_type="application/json")
 
 
 @api.get(
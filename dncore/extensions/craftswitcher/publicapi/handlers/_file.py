@@ -1,28 +1,35 @@
 import asyncio
-import shutil
+import functools
+import itertools
+import os
 from logging import getLogger
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Coroutine, NamedTuple
+from typing import TYPE_CHECKING, NamedTuple, TypeVar
 
 from fastapi import UploadFile, Depends, APIRouter
 from fastapi.params import Form, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse as RawStreamingResponse
+from pydantic import TypeAdapter
 
 from dncore.extensions.craftswitcher.errors import NoArchiveHelperError
 from dncore.extensions.craftswitcher.files import FileTask, FileEventType
-from dncore.extensions.craftswitcher.publicapi import APIError, APIErrorCode, model
+from dncore.extensions.craftswitcher.publicapi import APIErrorCode, model
 from dncore.extensions.craftswitcher.publicapi.server import StreamingResponse
-from dncore.extensions.craftswitcher.utils import disk_usage
+from dncore.extensions.craftswitcher.utils import disk_usage_cached
 from .common import *
 
 if TYPE_CHECKING:
     from dncore.extensions.craftswitcher import ServerProcess
 
 log = getLogger(__name__)
+_T = TypeVar("_T")
 api = APIRouter(
     tags=["File", ],
     dependencies=[Depends(get_authorized_user), ],
 )
+_FILE_TASK_LIST_ADAPTER = TypeAdapter(list[model.FileTask | model.BackupTask])
+_FILE_INFO_LIST_ADAPTER = TypeAdapter(list[model.FileInfo])
+FILES_STREAM_CHUNK_SIZE = 1000
 
 
 class PairPath(NamedTuple):
@@ -32,25 +39,47 @@ class PairPath(NamedTuple):
     root_dir: Path | None
 
 
-def create_file_info(path: PairPath | Path, root_dir: Path = None):
+def create_file_info(path: PairPath | Path, root_dir: Path = None, stats: os.stat_result = None):
     if isinstance(path, PairPath):
         _path = path.real
         root_dir = root_dir or path.root_dir
     else:
         _path = path
 
+    if stats is not None:
+        return inst.create_file_info_from_stat(_path, stats, root_dir=root_dir)
     return inst.create_file_info(_path, root_dir=root_dir)
 
 
-def wait_for_task(task: FileTask, timeout: float | None = 1) -> Coroutine[Any, Any, FileTask]:
-    return asyncio.wait_for(asyncio.shield(task.fut), timeout=timeout)
+async def wait_for_task(task: FileTask[_T], timeout: float | None = 1) -> _T:
+    if not task.fut.done():
+        # asyncio.wait はタイムアウトしても task.fut をキャンセルしない
+        done, _ = await asyncio.wait({task.fut}, timeout=timeout)
+        if not done:
+            raise asyncio.TimeoutError
+    return task.fut.result()
+
+
+def _validate_include_files(swi_paths: list[str], root_dir: Path | None) -> list[Path]:
+    include_files = [realpath(p, root_dir=root_dir) for p in swi_paths]
+
+    for path in include_files:
+        try:
+            os.lstat(path)
+        except OSError:
+            continue
+        break
+    else:
+        raise APIErrorCode.NOT_EXISTS_PATH.of("No files")
+
+    return include_files
 
 
 # param
 
 
 def get_pair_path(swi_path: str, *, server: "ServerProcess" = None):
-    root_dir = server and server.directory or None  # type: Path | None
+    root_dir = server and server.resolved_directory or None  # type: Path | None
     try:
         real_path = files.realpath(swi_path, root_dir=root_dir)
     except ValueError as e:
@@ -60,41 +89,31 @@ def get_pair_path(swi_path: str, *, server: "ServerProcess" = None):
 
 
 def get_path_of_root(query: str | Query = None, *, is_dir=False, is_file=False, exists=False, no_exists=False):
-    if query is None or isinstance(query, Query):
-        name = query and query.alias or "path"
-    else:
-        name = "path"
-        query = Query(description=query)
-
-    def check(path: str = query) -> PairPath:
-        p = get_pair_path(path)
-        if no_exists and p.real.exists():
-            if p.real.is_dir():
-                raise APIErrorCode.EXIST_DIRECTORY.of(f"Directory already exists: {name!r}")
-            elif p.real.is_file():
-                raise APIErrorCode.EXIST_FILE.of(f"File already exists: {name!r}")
-            raise APIErrorCode.ALREADY_EXISTS_PATH.of(f"Already exists: {name!r}")
-        elif is_dir and not p.real.is_dir():
-            raise APIErrorCode.NOT_EXISTS_DIRECTORY.of(f"Not a directory or not exists: {name!r}", 404)
-        elif is_file and not p.real.is_file():
-            raise APIErrorCode.NOT_EXISTS_FILE.of(f"Not a file or not exists: {name!r}", 404)
-        elif exists and not p.real.exists():
-            raise APIErrorCode.NOT_EXISTS_PATH.of(f"Not exists: {name!r}", 404)
-        return p
-
-    return check
+    return _create_path_checker(
+        *_query_key(query), is_dir=is_dir, is_file=is_file, exists=exists, no_exists=no_exists, scoped=False)
 
 
 def get_path_of_server_root(query: str | Query = None, *, is_dir=False, is_file=False, exists=False,
                             no_exists=False):
-    if query is None or isinstance(query, Query):
-        name = query and query.alias or "path"
-    else:
-        name = "path"
-        query = Query(description=query)
+    return _create_path_checker(
+        *_query_key(query), is_dir=is_dir, is_file=is_file, exists=exists, no_exists=no_exists, scoped=True)
+
+
+def _query_key(query: str | Query | None) -> tuple[str | None, str | None]:
+    if query is None:
+        return None, None
+    elif isinstance(query, Query):
+        return query.alias, query.description
+    return None, query
+
 
-    def check(path: str = query, server: "ServerProcess" = Depends(getserver)) -> PairPath:
-        p = get_pair_path(path, server=server)
+@functools.lru_cache(maxsize=None)
+def _create_path_checker(alias: str | None, description: str | None, *,
+                         is_dir: bool, is_file: bool, exists: bool, no_exists: bool, scoped: bool):
+    name = alias or "path"
+    query = Query(alias=alias, description=description) if alias or description else None
+
+    def _check(p: PairPath) -> PairPath:
         if no_exists and p.real.exists():
             if p.real.is_dir():
                 raise APIErrorCode.EXIST_DIRECTORY.of(f"Directory already exists: {name!r}")
@@ -109,6 +128,13 @@ def get_path_of_server_root(query: str | Query = None, *, is_dir=False, is_file=
             raise APIErrorCode.NOT_EXISTS_PATH.of(f"Not exists: {name!r}", 404)
         return p
 
+    if scoped:
+        def check(path: str = query, server: "ServerProcess" = Depends(getserver)) -> PairPath:
+            return _check(get_pair_path(path, server=server))
+    else:
+        def check(path: str = query) -> PairPath:
+            return _check(get_pair_path(path))
+
     return check
 
 
@@ -116,36 +142,70 @@ def get_path_of_server_root(query: str | Query = None, *, is_dir=False, is_file=
 
 @api.get(
     "/file/tasks",
+    response_model=list[model.FileTask | model.BackupTask],
     summary="ファイルタスクの一覧",
     description="実行中のファイル操作タスクのリストを返す",
 )
-def _file_tasks() -> list[model.FileTask | model.BackupTask]:
-    return [model.FileTask.create(task) for task in files.tasks]
+async def _file_tasks() -> Response:
+    ls = [model.FileTask.create(task) for task in files.tasks]
+    # 再検証で BackupTask が FileTask として扱われないよう、作成したモデルのまま JSON に変換する
+    return Response(_FILE_TASK_LIST_ADAPTER.dump_json(ls), media_type="application/json")
 
 
 @api.get(
     "/files",
+    response_model=model.FileDirectoryInfo,
     summary="ファイルの一覧",
     description="指定されたパスのファイルリストを返す",
 )
 async def _files(
     path: PairPath = Depends(get_path_of_root(is_dir=True)),
-) -> model.FileDirectoryInfo:
-    file_list = []
+    stream: bool = Query(False, description="ファイルを少しずつ読み込みながら返す (大きなディレクトリ向け)"),
+) -> Response:
     try:
-        for child in path.real.iterdir():
+        parent_swi_by_root = files.swipath(path.real)
+    except ValueError:
+        parent_swi_by_root = None  # rootDir外のため、登録サーバーを検索しない
+    name = "" if path.swi == "/" else path.real.name
+    parent_path = path.swi.rsplit("/", 1)[0] or "/"
+
+    if stream:
+        try:
+            entries = os.scandir(path.real)
+        except PermissionError as e:
+            raise APIErrorCode.NOT_ALLOWED_PATH.of(f"Unable to access: {e}")
+
+        def _iter_chunks():
             try:
-                file_list.append(create_file_info(child, path.root_dir))
-            except Exception as e:
-                log.warning("Failed to get file info: %s: %s", str(child), str(e))
+                # children を最後に空で出力し、末尾の "]}" を除いたものを先頭として使う
+                head = model.FileDirectoryInfo.model_construct(name=name, path=parent_path, children=[])
+                yield head.model_dump_json()[:-2].encode("utf-8")
+
+                separator = b""
+                while chunk := list(itertools.islice(entries, FILES_STREAM_CHUNK_SIZE)):
+                    file_list = inst.create_file_infos(
+                        chunk, path.real, path.swi, parent_swipath_by_root=parent_swi_by_root,
+                    )
+                    if file_list:
+                        yield separator + _FILE_INFO_LIST_ADAPTER.dump_json(file_list)[1:-1]
+                        separator = b","
+                yield b"]}"
+            finally:
+                entries.close()
+
+        return RawStreamingResponse(_iter_chunks(), media_type="application/json")
+
+    try:
+        with os.scandir(path.real) as entries:
+            file_list = inst.create_file_infos(
+                entries, path.real, path.swi, parent_swipath_by_root=parent_swi_by_root,
+            )
     except PermissionError as e:
         raise APIErrorCode.NOT_ALLOWED_PATH.of(f"Unable to access: {e}")
 
-    return model.FileDirectoryInfo(
-        name="" if path.swi == "/" else path.real.name,
-        path=files.swipath(path.real.parent, force=True, root_dir=path.root_dir),
-        children=file_list,
-    )
+    # 件数が多くなるため、レスポンスモデルでの再検証を通さずに直接 JSON に変換する
+    info = model.FileDirectoryInfo.model_construct(name=name, path=parent_path, children=file_list)
+    return Response(info.model_dump_json(), media_type="application/json")
 
 
 @api.get(
@@ -185,18 +245,13 @@ async def _post_file(
         raise APIErrorCode.NOT_FILE.of("Not a file: 'path'")
 
     def _do():
-        try:
-            with path.real.open("wb") as f:
-                # noinspection PyTypeChecker
-                shutil.copyfileobj(file.file, f)
-        finally:
-            file.file.close()
+        return write_upload_file(file, path.real)
 
-    await files.create_task_in_executor(
+    stats = await files.create_task_in_executor(
         FileEventType.CREATE, path.real, None, _do, executor=None,
         server=path.server, src_swi_path=path.swi, dst_swi_path=None,
     )
-    return create_file_info(path, path.root_dir)
+    return create_file_info(path, path.root_dir, stats)
 
 
 @api.delete(
@@ -229,14 +284,14 @@ async def _mkdir(
     parents: bool = Query(False, description="親ディレクトリも作成します"),
 ) -> model.FileOperationResult:
     try:
-        await files.mkdir(path.real, parents=parents)
+        stats = await files.mkdir(path.real, parents=parents)
     except FileNotFoundError:
         raise APIErrorCode.NOT_EXISTS_PATH.of(f"Not exists parents: 'path'")
     except Exception as e:
         log.warning(f"Failed to mkdir: {e}: {path}")
         return model.FileOperationResult.failed(None)
     else:
-        return model.FileOperationResult.success(None, create_file_info(path))
+        return model.FileOperationResult.success(None, create_file_info(path, stats=stats))
 
 
 @api.put(
@@ -253,14 +308,14 @@ async def _copy(
         server=path.server, src_swi_path=path.swi, dst_swi_path=dst_path.swi,
     )
     try:
-        await wait_for_task(task)
+        stats = await wait_for_task(task)
     except asyncio.TimeoutError:
         return model.FileOperationResult.pending(task.id)
     except Exception as e:
         log.warning(f"Failed to copy: {e}: {path}")
         return model.FileOperationResult.failed(task.id)
     else:
-        return model.FileOperationResult.success(task.id, create_file_info(dst_path))
+        return model.FileOperationResult.success(task.id, create_file_info(dst_path, stats=stats))
 
 
 @api.put(
@@ -277,14 +332,14 @@ async def _move(
         server=path.server, src_swi_path=path.swi, dst_swi_path=dst_path.swi,
     )
     try:
-        await wait_for_task(task)
+        stats = await wait_for_task(task)
     except asyncio.TimeoutError:
         return model.FileOperationResult.pending(task.id)
     except Exception as e:
         log.warning(f"Failed to move: {e}: {path}")
         return model.FileOperationResult.failed(task.id)
     else:
-        return model.FileOperationResult.success(task.id, create_file_info(dst_path))
+        return model.FileOperationResult.success(task.id, create_file_info(dst_path, stats=stats))
 
 
 @api.post(
@@ -315,7 +370,7 @@ async def _archive_extract_file(
     ignore_suffix: bool = Query(False, description="拡張子に関わらずファイルを処理する"),
 
 ) -> StreamingResponse:
-    chunk_size = 1024 * 512
+    chunk_size = 1024 * 1024
 
     helper = files.find_archive_helper(path.real, ignore_suffix=ignore_suffix)
     if not helper:
@@ -372,13 +427,8 @@ async def _archive_make(
         get_path_of_root(Query(alias="files_root", description="格納するファイルのルートパス"))),
     include_files: list[str] = Query(description="格納するファイルのパス"),
 ) -> model.FileOperationResult:
-    try:
-        include_files = [realpath(p, root_dir=files_root.root_dir) for p in include_files]
-    except APIError:
-        raise
-
-    if not any(p.exists() for p in include_files):
-        raise APIErrorCode.NOT_EXISTS_PATH.of("No files")
+    include_files = await asyncio.get_running_loop().run_in_executor(
+        None, _validate_include_files, include_files, files_root.root_dir)
 
     try:
         task = await files.make_archive(
@@ -394,13 +444,15 @@ async def _archive_make(
 
 @api.get(
     "/server/{server_id}/files",
+    response_model=model.FileDirectoryInfo,
     summary="ファイルの一覧",
     description="指定されたパスのファイルリストを返す",
 )
 async def _server_files(
     path: PairPath = Depends(get_path_of_server_root(is_dir=True)),
-) -> model.FileDirectoryInfo:
-    return await _files(path)
+    stream: bool = Query(False, description="ファイルを少しずつ読み込みながら返す (大きなディレクトリ向け)"),
+) -> Response:
+    return await _files(path, stream)
 
 
 @api.get(
@@ -545,11 +597,11 @@ async def _server_archive_make(
     "/storage/info",
     summary="ディスク使用量の取得",
 )
-def _storage_info(server_id: str | None = None) -> model.StorageInfo:
+def _storage_info(server_id: ServerId | None = None) -> model.StorageInfo:
     if server_id is not None:
-        info = disk_usage(getserver(server_id).directory)
+        info = disk_usage_cached(getserver(server_id).resolved_directory)
     else:
-        info = disk_usage(files.root_dir)
+        info = disk_usage_cached(files.root_dir)
     return model.StorageInfo(
         total_size=info.total_bytes,
         used_size=info.used_bytes,
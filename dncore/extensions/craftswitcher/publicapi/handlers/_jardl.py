@@ -1,15 +1,27 @@
+import asyncio
+from logging import getLogger
+
+import orjson
 from fastapi import Depends, APIRouter
+from fastapi.responses import Response
+from pydantic import TypeAdapter
 
 from dncore.extensions.craftswitcher.abc import ServerType
 from dncore.extensions.craftswitcher.jardl import ServerDownloader, ServerMCVersion, ServerBuild
 from dncore.extensions.craftswitcher.publicapi import model
 from .common import *
 
+log = getLogger(__name__)
 api = APIRouter(
     prefix="/jardl",
     tags=["Server Installer", ],
     dependencies=[Depends(get_authorized_user), ],
 )
+LIST_BUILDS_CONCURRENCY = 8
+# downloader -> (バージョン一覧, ビルド数, エンコード済みのレスポンス)
+_versions_responses = {}  # type: dict[ServerDownloader, tuple[list[ServerMCVersion], tuple[int | None, ...], bytes]]
+_VERSION_BUILDS_LIST_ADAPTER = TypeAdapter(list[model.JarDLVersionBuildsInfo])
+_BUILD_LIST_ADAPTER = TypeAdapter(list[model.JarDLBuildInfo])
 
 
 @api.get(
@@ -22,34 +34,68 @@ def __lists() -> list[ServerType]:
 
 @api.get(
     "/{server_type}/versions",
+    response_model=list[model.JarDLVersionInfo],
     summary="対応バージョンの一覧"
 )
-async def __versions(downloader: ServerDownloader = Depends(getdownloader)) -> list[model.JarDLVersionInfo]:
+async def __versions(downloader: ServerDownloader = Depends(getdownloader)) -> Response:
+    versions = await downloader.list_versions()
+    build_counts = tuple(None if v.builds is None else len(v.builds) for v in versions)
+
+    # 一覧とビルド数が変わらない限り、エンコード済みの内容を再利用する
+    cached = _versions_responses.get(downloader)
+    if cached and cached[0] is versions and cached[1] == build_counts:
+        content = cached[2]
+    else:
+        content = orjson.dumps([
+            dict(version=v.mc_version, build_count=count)
+            for v, count in zip(versions, build_counts)
+        ])
+        _versions_responses[downloader] = versions, build_counts, content
+
+    return Response(content, media_type="application/json")
+
+
+@api.get(
+    "/{server_type}/versions/all",
+    response_model=list[model.JarDLVersionBuildsInfo],
+    summary="対応バージョンとビルドの一覧",
+    description="全てのバージョンのビルド一覧をまとめて返します。ビルドの取得に失敗したバージョンは builds が null になります。",
+)
+async def __versions_all(
+    downloader: ServerDownloader = Depends(getdownloader),
+) -> Response:
     versions = await downloader.list_versions()
+    semaphore = asyncio.Semaphore(LIST_BUILDS_CONCURRENCY)
+
+    async def _list_builds(v: ServerMCVersion):
+        async with semaphore:
+            return await v.list_builds()
 
-    return [model.JarDLVersionInfo(
-        version=v.mc_version,
-        build_count=None if v.builds is None else len(v.builds)
-    ) for v in versions]
+    results = await asyncio.gather(*(_list_builds(v) for v in versions), return_exceptions=True)
+
+    ls = []  # type: list[model.JarDLVersionBuildsInfo]
+    for version, builds in zip(versions, results):
+        if isinstance(builds, BaseException):
+            log.warning("Failed to list builds: %s: %s", version.mc_version, str(builds))
+            builds = None
+        ls.append(model.JarDLVersionBuildsInfo.model_construct(
+            version=version.mc_version,
+            builds=None if builds is None else [model.JarDLBuildInfo.create(b) for b in builds],
+        ))
+
+    # ビルド情報は create() で検証済みのため、レスポンスモデルで再検証せずに直接 JSON に変換する
+    return Response(_VERSION_BUILDS_LIST_ADAPTER.dump_json(ls), media_type="application/json")
 
 
 @api.get(
     "/{server_type}/version/{version}/builds",
+    response_model=list[model.JarDLBuildInfo],
     summary="ビルドの一覧",
 )
-async def __builds(version: ServerMCVersion = Depends(getversion)) -> list[model.JarDLBuildInfo]:
+async def __builds(version: ServerMCVersion = Depends(getversion)) -> Response:
     builds = await version.list_builds()
-
-    return [model.JarDLBuildInfo(
-        build=b.build,
-        download_url=b.download_url,
-        java_major_version=b.java_major_version,
-        require_jdk=b.require_jdk,
-        updated_datetime=b.updated_datetime,
-        recommended=b.recommended,
-        is_require_build=b.is_require_build(),
-        is_loaded_info=b.is_loaded_info(),
-    ) for b in builds]
+    ls = [model.JarDLBuildInfo.create(b) for b in builds]
+    return Response(_BUILD_LIST_ADAPTER.dump_json(ls), media_type="application/json")
 
 
 @api.get(
@@ -59,13 +105,4 @@ async def __builds(version: ServerMCVersion = Depends(getversion)) -> list[model
 )
 async def __build_info(build: ServerBuild = Depends(getbuild)) -> model.JarDLBuildInfo:
     await build.fetch_info()
-    return model.JarDLBuildInfo(
-        build=build.build,
-        download_url=build.download_url,
-        java_major_version=build.java_major_version,
-        require_jdk=build.require_jdk,
-        updated_datetime=build.updated_datetime,
-        recommended=build.recommended,
-        is_require_build=build.is_require_build(),
-        is_loaded_info=build.is_loaded_info(),
-    )
+    return model.JarDLBuildInfo.create(build)
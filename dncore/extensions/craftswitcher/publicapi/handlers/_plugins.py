@@ -1,5 +1,3 @@
-import shutil
-
 from fastapi import UploadFile, Depends, APIRouter
 from fastapi.responses import FileResponse, JSONResponse
 
@@ -57,7 +55,7 @@ async def _plugin_file(
             caption=res.caption,
             content=res.content,
             errors=res.errors,
-        ).model_dump_json())
+        ).model_dump(mode="json"))
 
     return FileResponse(file.path, filename=file.path.name)
 
@@ -81,14 +79,9 @@ async def _plugin_file(
             caption=res.caption,
             content=res.content,
             errors=res.errors,
-        ).model_dump_json())
+        ).model_dump(mode="json"))
 
-    try:
-        with file.path.open("wb") as f:
-            # noinspection PyTypeChecker
-            shutil.copyfileobj(content.file, f)
-    finally:
-        content.file.close()
+    write_upload_file(content, file.path)
 
     res = await ext.on_file_update(file)
     if res:
@@ -97,6 +90,6 @@ async def _plugin_file(
             caption=res.caption,
             content=res.content,
             errors=res.errors,
-        ).model_dump_json())
+        ).model_dump(mode="json"))
 
     return model.FileOperationResult.success(None, None)
@@ -1,9 +1,13 @@
-from typing import TYPE_CHECKING, Any
+import itertools
+from typing import TYPE_CHECKING
 
+import orjson
 from fastapi import Depends, APIRouter
+from fastapi.concurrency import run_in_threadpool
 from fastapi.params import Query
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import TypeAdapter
 
-from dncore.configuration.configuration import ConfigValues
 from dncore.extensions.craftswitcher import errors
 from dncore.extensions.craftswitcher.abc import ServerType, ServerState
 from dncore.extensions.craftswitcher.errors import NoDownloadFile
@@ -18,27 +22,29 @@ if TYPE_CHECKING:
 api = APIRouter(
     tags=["Server", ],
     dependencies=[Depends(get_authorized_user), ],
+    default_response_class=ORJSONResponse,
 )
+_CONFIG_SETTER_PATHS = {
+    name: tuple(name.split("__")) for name in model.ServerConfig.model_fields
+}  # type: dict[str, tuple[str, ...]]
+_SERVER_LIST_ADAPTER = TypeAdapter(list[model.Server])
 
 
 @api.get(
     "/servers",
+    response_model=list[model.Server],
     summary="登録サーバーの一覧",
     description="登録されているサーバーを返します",
 )
 async def _list(
     only_loaded: bool = False,
     include_status: bool = Query(False, description="サーバーとプロセスの情報を取得するか"),
-) -> list[model.Server]:
+) -> Response:
     ls = []  # type: list[model.Server]
 
     for server_id, server in servers.items():
         if server:
-            try:
-                server_swi_path = inst.swipath_server(server)
-            except ValueError:
-                server_swi_path = None
-            ls.append(model.Server.create(server, server_swi_path, include_status))
+            ls.append(model.Server.create(server, inst.try_swipath_server(server), include_status))
         elif not only_loaded:
             try:
                 server_dir = inst.config.servers[server_id]
@@ -46,7 +52,8 @@ async def _list(
                 continue  # 外部から削除または変更されていた場合はリストから静かに除外する
             ls.append(model.Server.create_no_data(server_id, inst.files.resolvepath(server_dir, force=True)))
 
-    return ls
+    # 定期的に取得されるため、レスポンスモデルでの再検証を通さずに直接 JSON に変換する
+    return Response(_SERVER_LIST_ADAPTER.dump_json(ls), media_type="application/json")
 
 
 @api.post(
@@ -137,7 +144,7 @@ async def _send_line(line: str, server: "ServerProcess" = Depends(getserver), )
     summary="疑似端末のウインドウサイズを取得",
     description="幅x高のカーソル数を返します",
 )
-def _get_term_size(
+async def _get_term_size(
     server: "ServerProcess" = Depends(getserver),
 ) -> tuple[int, int]:
     return server.term_size
@@ -148,7 +155,7 @@ def _get_term_size(
     summary="疑似端末のウインドウサイズを設定",
     description="幅x高のカーソル数を返します",
 )
-def _set_term_size(
+async def _set_term_size(
     cols: int, rows: int,
     server: "ServerProcess" = Depends(getserver),
 ) -> tuple[int, int]:
@@ -160,17 +167,30 @@ def _set_term_size(
     "/server/{server_id}/logs/latest",
     summary="サーバープロセスの出力ログ",
 )
-def _logs_latest(
+async def _logs_latest(
     server: "ServerProcess" = Depends(getserver),
     max_lines: int | None = Query(None, ge=1, description=(
             "取得する最大行数。null でキャッシュされている全ての行を出力します。"
     )),
     include_buffer: bool = Query(False, description="改行されていない行を含みます"),
+    stream: bool = Query(False, description="1行ずつ JSON 文字列で出力します (application/x-ndjson)"),
 ) -> list[str]:
     logs = server.logs
-    ls = list(logs) if max_lines is None else list(logs)[-max_lines + include_buffer:]
+    if max_lines is None:
+        ls = list(logs)
+    else:
+        # 末尾から必要な行数だけ辿り、先頭側の読み飛ばしを避ける
+        ls = list(itertools.islice(reversed(logs), max_lines - include_buffer))
+        ls.reverse()
     if include_buffer:
         ls.append(logs.buffer)
+
+    if stream:
+        # 一覧全体を一度にエンコードせず、行ごとに書き出す
+        return StreamingResponse(
+            (orjson.dumps(line) + b"\n" for line in ls),
+            media_type="application/x-ndjson",
+        )
     return ls
 
 
@@ -180,11 +200,10 @@ def _logs_latest(
     description="構成済みのサーバーを登録します",
 )
 async def _add(
-    server_id: str,
+    server_id: ServerId,
     param: model.AddServerParam,
     eula: bool | None = Query(False, description="Minecraft EULA に同意されていれば true にできます"),
 ) -> model.ServerOperationResult:
-    server_id = server_id.lower()
     if server_id in servers:
         raise APIErrorCode.ALREADY_EXISTS_ID.of("Already exists server id")
 
@@ -205,11 +224,10 @@ async def _add(
     "/server/{server_id}",
     summary="サーバー情報を取得",
 )
-def _get(
-    server_id: str,
+async def _get(
+    server_id: ServerId,
     include_status: bool = Query(False, description="サーバーとプロセスの情報を取得するか"),
 ) -> model.Server:
-    server_id = server_id.lower()
     try:
         server = servers[server_id]
     except KeyError:
@@ -225,12 +243,7 @@ def _get(
 
         return model.Server.create_no_data(server_id, server_dir)
 
-    try:
-        server_swi_path = inst.swipath_server(server)
-    except ValueError:
-        server_swi_path = None
-
-    return model.Server.create(server, server_swi_path, include_status)
+    return model.Server.create(server, inst.try_swipath_server(server), include_status)
 
 
 @api.post(
@@ -239,11 +252,10 @@ def _get(
     description="サーバーを作成します",
 )
 async def _create(
-    server_id: str,
+    server_id: ServerId,
     param: model.CreateServerParam,
     eula: bool | None = Query(False, description="Minecraft EULA に同意されていれば true にできます"),
 ) -> model.ServerOperationResult:
-    server_id = server_id.lower()
     if server_id in servers:
         raise APIErrorCode.ALREADY_EXISTS_ID.of("Already exists server id")
 
@@ -281,8 +293,7 @@ async def _create(
     summary="サーバーを削除",
     description="サーバーを削除します",
 )
-async def _delete(server_id: str, delete_config_file: bool = False, ) -> model.ServerOperationResult:
-    server_id = server_id.lower()
+async def _delete(server_id: ServerId, delete_config_file: bool = False, ) -> model.ServerOperationResult:
     try:
         server = servers[server_id]
     except KeyError:
@@ -305,16 +316,7 @@ async def _delete(server_id: str, delete_config_file: bool = False, ) -> model.S
     description="サーバーの設定を返します",
 )
 async def _get_config(server: "ServerProcess" = Depends(getserver), ) -> model.ServerConfig:
-    def toflat(keys: list[str], conf: "ConfigValues") -> dict[str, Any]:
-        ls = {}
-        for key, entry in conf.get_values().items():
-            if isinstance(entry.value, ConfigValues):
-                ls.update(toflat([*keys, key], entry.value))
-            else:
-                ls[".".join([*keys, key])] = entry.value
-        return ls
-
-    return model.ServerConfig(**toflat([], server._config))
+    return model.ServerConfig(**flatten_config(server._config))
 
 
 @api.put(
@@ -325,13 +327,12 @@ async def _get_config(server: "ServerProcess" = Depends(getserver), ) -> model.S
 async def _put_config(param: model.ServerConfig, server: "ServerProcess" = Depends(getserver),
                       ) -> model.ServerConfig:
     config = server._config  # type: ServerConfig
-    for key, value in param.model_dump(exclude_unset=True).items():
+    for key in param.model_fields_set:
+        *parents, name = _CONFIG_SETTER_PATHS[key]
         conf = config
-
-        key = key.split("__")
-        while 2 <= len(key):
-            conf = getattr(conf, key.pop(0))
-        setattr(conf, key[0], value)
+        for parent in parents:
+            conf = getattr(conf, parent)
+        setattr(conf, name, getattr(param, key))
 
     server._config.save(force=True)
     return await _get_config(server)
@@ -352,9 +353,9 @@ async def _reload_config(server: "ServerProcess" = Depends(getserver), ) -> mode
     summary="EULA の値を取得",
     description="EULAファイルの値を返します",
 )
-def _get_eula(server: "ServerProcess" = Depends(getserver), ) -> bool | None:
+async def _get_eula(server: "ServerProcess" = Depends(getserver), ) -> bool | None:
     try:
-        return server.is_eula_accepted(ignore_not_exists=False)
+        return await run_in_threadpool(server.is_eula_accepted, ignore_not_exists=False)
     except FileNotFoundError:
         return None
 
@@ -364,12 +365,15 @@ def _get_eula(server: "ServerProcess" = Depends(getserver), ) -> bool | None:
     summary="EULA の値を設定",
     description="EULAファイルの値を変更します",
 )
-def _post_eula(
+async def _post_eula(
     server: "ServerProcess" = Depends(getserver),
     accept: bool = Query(description="Minecraft EULA に同意されていれば true にできます"),
 ) -> model.FileInfo:
-    eula_path = server.set_eula_accept(accept)
-    return inst.create_file_info(eula_path, root_dir=server.directory)
+    def _do():
+        eula_path = server.set_eula_accept(accept)
+        return inst.create_file_info(eula_path, root_dir=server.resolved_directory)
+
+    return await run_in_threadpool(_do)
 
 
 @api.post(
@@ -402,7 +406,7 @@ async def _delete_build(
     server: "ServerProcess" = Depends(getserver),
 ) -> model.ServerOperationResult:
     if ServerState.BUILD == server.state:
-        return model.ServerOperationResult.failed(server)
+        return model.ServerOperationResult.failed(server.id)
 
     await server.clean_builder()
-    return model.ServerOperationResult.success(server)
+    return model.ServerOperationResult.success(server.id)
@@ -1,5 +1,6 @@
 from fastapi import Response, Depends, Request, APIRouter
 from fastapi.params import Form
+from fastapi.responses import ORJSONResponse
 
 from dncore.extensions.craftswitcher.database.model import User
 from dncore.extensions.craftswitcher.publicapi import APIError, APIErrorCode, model
@@ -9,9 +10,11 @@ from .common import *
 api = APIRouter(
     tags=["User", ],
     dependencies=[Depends(get_authorized_user)],
+    default_response_class=ORJSONResponse,
 )
 no_auth_api = APIRouter(
     tags=["User", ],
+    default_response_class=ORJSONResponse,
 )
 
 
@@ -59,6 +62,7 @@ async def _login(request: Request, response: Response, form_data: OAuth2Password
         last_login=datetime_now(),
         last_address=request.client.host,
     )
+    purge_authorized_user(user.id)
 
     response.set_cookie(
         key="session",
@@ -95,4 +99,5 @@ async def _user_add(form_data: OAuth2PasswordRequestForm = Depends()) -> model.U
 )
 async def _user_remove(user: User = Depends(getuser)) -> model.UserOperationResult:
     await db.remove_user(user)
+    purge_authorized_user(user.id)
     return model.UserOperationResult.success(user.id)
@@ -1,18 +1,29 @@
+import datetime
+import io
+import operator
+import os
+import shutil
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Annotated, Any
 
-from fastapi import HTTPException, WebSocket, APIRouter, Depends
+from fastapi import HTTPException, WebSocket, APIRouter, Depends, UploadFile
 from fastapi.exceptions import WebSocketException
 from fastapi.requests import HTTPConnection
+from fastapi.responses import ORJSONResponse
+from pydantic import BeforeValidator
 
+from dncore.configuration.configuration import ConfigValues
 from dncore.extensions.craftswitcher.abc import ServerType
 from dncore.extensions.craftswitcher.jardl import ServerMCVersion, ServerDownloader
 from dncore.extensions.craftswitcher.publicapi import APIErrorCode
+from dncore.extensions.craftswitcher.utils import datetime_now
 
 if TYPE_CHECKING:
     from dncore.extensions.craftswitcher import CraftSwitcher
     from dncore.extensions.craftswitcher.fileback import Backupper
     from dncore.extensions.craftswitcher.database import SwitcherDatabase
+    from dncore.extensions.craftswitcher.database.model import User
     from dncore.extensions.craftswitcher.files import FileManager
     from dncore.extensions.craftswitcher.serverprocess import ServerProcessList
     from dncore.extensions.craftswitcher.publicapi import APIHandler
@@ -24,13 +35,17 @@ __all__ = [
     "servers",
     "files",
     "api_handler",
+    "ServerId",
     "get_authorized_user",
     "get_authorized_user_ws",
+    "purge_authorized_user",
     "getserver",
     "realpath",
     "getdownloader",
     "getversion",
     "getbuild",
+    "write_upload_file",
+    "flatten_config",
 ]
 
 inst: "CraftSwitcher"
@@ -40,6 +55,46 @@ servers: "ServerProcessList"
 files: "FileManager"
 api_handler: "APIHandler"
 
+# サーバーIDは小文字のみなので、受け取り時に正規化する
+ServerId = Annotated[str, BeforeValidator(str.lower)]
+
+AUTHORIZED_USER_CACHE_TTL = 30
+AUTHORIZED_USER_CACHE_SIZE = 1024
+_authorized_users = {}  # type: dict[str, tuple[float, User]]  # token -> (期限, ユーザー)
+
+
+def _cache_authorized_user(token: str, user: "User"):
+    now = time.monotonic()
+    if len(_authorized_users) >= AUTHORIZED_USER_CACHE_SIZE:
+        for _token, (deadline, _) in list(_authorized_users.items()):
+            if deadline <= now:
+                _authorized_users.pop(_token, None)
+        if len(_authorized_users) >= AUTHORIZED_USER_CACHE_SIZE:
+            _authorized_users.clear()
+
+    ttl = AUTHORIZED_USER_CACHE_TTL
+    if user.token_expire is not None:
+        # トークンの有効期限を超えてキャッシュしない
+        token_expire = user.token_expire.replace(tzinfo=datetime.timezone.utc)
+        ttl = min(ttl, (token_expire - datetime_now()).total_seconds())
+    if ttl > 0:
+        _authorized_users[token] = now + ttl, user
+
+
+def purge_authorized_user(user_id: int = None):
+    """
+    認証済みユーザーのキャッシュを削除します
+
+    :arg user_id: 削除するユーザーID。未指定なら全て削除します
+    """
+    if user_id is None:
+        _authorized_users.clear()
+        return
+
+    for token, (_, user) in list(_authorized_users.items()):
+        if user.id == user_id:
+            _authorized_users.pop(token, None)
+
 
 async def get_authorized_user(connection: HTTPConnection):
     try:
@@ -47,8 +102,18 @@ async def get_authorized_user(connection: HTTPConnection):
     except KeyError:
         pass
     else:
+        try:
+            deadline, user = _authorized_users[token]
+        except KeyError:
+            pass
+        else:
+            if time.monotonic() < deadline:
+                return user
+            _authorized_users.pop(token, None)
+
         user = await db.get_user_by_valid_token(token)
         if user:
+            _cache_authorized_user(token, user)
             return user
 
     raise APIErrorCode.INVALID_AUTHENTICATION_CREDENTIALS.of("Invalid authentication credentials", 401)
@@ -61,9 +126,9 @@ async def get_authorized_user_ws(websocket: WebSocket):
         raise WebSocketException(1008) from e
 
 
-def getserver(server_id: str):
+def getserver(server_id: ServerId):
     try:
-        server = servers[server_id.lower()]
+        server = servers[server_id]
     except KeyError:
         raise APIErrorCode.SERVER_NOT_FOUND.of("Server not found", 404)
 
@@ -87,21 +152,80 @@ def getdownloader(server_type: ServerType):
 
 
 async def getversion(version: str, downloader: ServerDownloader = Depends(getdownloader)):
-    for ver in await downloader.list_versions():
-        if ver.mc_version == version:
-            return ver
+    ver = await downloader.get_version(version)
+    if ver is not None:
+        return ver
     raise APIErrorCode.NOT_EXISTS_SERVER_VERSION.of("No found version", 404)
 
 
 async def getbuild(build: str, version: ServerMCVersion = Depends(getversion)):
-    for b in await version.list_builds():
-        if b.build == build:
-            return b
+    b = await version.get_build(build)
+    if b is not None:
+        return b
     raise APIErrorCode.NOT_EXISTS_SERVER_BUILD.of("No found build", 404)
 
 
+def write_upload_file(file: UploadFile, path: Path):
+    """
+    アップロードされたファイルを path に書き込み、閉じます
+
+    一時ファイルに書き出されていない (メモリ上にある) 場合は、バッファから直接書き込みます
+
+    :return: 書き込んだファイルの stat 情報
+    """
+    try:
+        buffer = getattr(file.file, "_file", None)
+        with path.open("wb") as f:
+            if isinstance(buffer, io.BytesIO):
+                with buffer.getbuffer() as view:
+                    f.write(view)
+            else:
+                # noinspection PyTypeChecker
+                shutil.copyfileobj(file.file, f)
+            f.flush()
+            return os.fstat(f.fileno())
+    finally:
+        file.file.close()
+
+
+_flat_config_schemas = {}  # type: dict[type[ConfigValues], tuple[tuple[str, operator.attrgetter], ...]]
+
+
+def _flat_config_schema(conf: ConfigValues):
+    """
+    ドット区切りのキーと、その値を取得する attrgetter のリストを返します
+
+    キーの構成は ConfigValues のクラスごとに固定なので、クラスごとにキャッシュされます
+    """
+    try:
+        return _flat_config_schemas[type(conf)]
+    except KeyError:
+        pass
+
+    def walk(keys: tuple[str, ...], _conf: ConfigValues):
+        for key, entry in _conf.get_values().items():
+            if isinstance(entry.value, ConfigValues):
+                yield from walk((*keys, key), entry.value)
+            else:
+                dotted_key = ".".join((*keys, key))
+                yield dotted_key, operator.attrgetter(dotted_key)
+
+    schema = _flat_config_schemas[type(conf)] = tuple(walk((), conf))
+    return schema
+
+
+def flatten_config(conf: ConfigValues) -> dict[str, Any]:
+    """
+    ネストされた設定値を、ドット区切りのキーを持つ辞書で返します
+    """
+    return {key: getter(conf) for key, getter in _flat_config_schema(conf)}
+
+
 #
 
+_api_router = None  # type: APIRouter | None
+
+
 def create_api_handlers(
     _handler: "APIHandler",
     _inst: "CraftSwitcher",
@@ -111,6 +235,7 @@ def create_api_handlers(
     _files: "FileManager",
 ):
     global inst, db, backups, servers, files, api_handler
+    _authorized_users.clear()
     inst = _inst
     db = _db
     backups = _backups
@@ -118,9 +243,14 @@ def create_api_handlers(
     files = _files
     api_handler = _handler
 
+    # ルーターの組み立ては重いので一度だけ行い、以降はグローバル変数の差し替えのみ
+    global _api_router
+    if _api_router is not None:
+        return _api_router
+
     from . import _app, _user, _server, _file, _backup, _jardl, _plugins, _debug
 
-    api = APIRouter(prefix="/api")
+    api = APIRouter(prefix="/api", default_response_class=ORJSONResponse)
     api.include_router(_app.no_auth_api)
     api.include_router(_app.api)
     api.include_router(_user.no_auth_api)
@@ -131,4 +261,5 @@ def create_api_handlers(
     api.include_router(_jardl.api)
     api.include_router(_plugins.api)
     api.include_router(_debug.api)
+    _api_router = api
     return api
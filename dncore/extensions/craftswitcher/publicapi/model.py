@@ -1,9 +1,8 @@
 import datetime
-from pathlib import Path
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
 from dncore.extensions.craftswitcher import abc
 from dncore.extensions.craftswitcher.fileback import abc as fbabc
@@ -16,6 +15,12 @@ if TYPE_CHECKING:
     from dncore.extensions.craftswitcher import ServerProcess
     from dncore.extensions.craftswitcher.ext import ExtensionInfo, EditableFile
     from dncore.extensions.craftswitcher.database import model as db
+    from dncore.extensions.craftswitcher.jardl import ServerBuild
+
+
+def _dotted_alias(key: str):
+    # launch_option__java_preset -> launch_option.java_preset
+    return key.replace("__", ".")
 
 
 class SwitcherConfig(BaseModel):
@@ -62,7 +67,8 @@ class Server(BaseModel):
 
     @classmethod
     def create(cls, server: "ServerProcess", directory: str | None, include_status: bool):
-        return cls(
+        # 値は内部で管理されたものなので検証を省略する
+        return cls.model_construct(
             id=server.id,
             name=server.config.name,
             type=server.config.type,
@@ -75,7 +81,7 @@ class Server(BaseModel):
 
     @classmethod
     def create_no_data(cls, server_id: str, directory: str):
-        return cls(
+        return cls.model_construct(
             id=server_id,
             name=None,
             type=abc.ServerType.UNKNOWN,
@@ -91,13 +97,14 @@ class ServerOperationResult(BaseModel):
     result: bool
     server_id: str
 
+    # 結果は内部で生成されたものなので検証を省略する
     @classmethod
-    def success(cls, server: "str | ServerProcess"):
-        return cls(result=True, server_id=server if isinstance(server, str) else server.id)
+    def success(cls, server_id: str):
+        return cls.model_construct(result=True, server_id=server_id)
 
     @classmethod
-    def failed(cls, server: "str | ServerProcess"):
-        return cls(result=False, server_id=server if isinstance(server, str) else server.id)
+    def failed(cls, server_id: str):
+        return cls.model_construct(result=False, server_id=server_id)
 
 
 class CreateServerParam(BaseModel):
@@ -156,10 +163,7 @@ class ServerConfig(BaseModel):
     installer__build: str | None = Field(None, description="インストールされたサーバービルド")
     installer__require_build: bool | None = Field(None, description="ビルドが必要なインストーラー")
 
-    class Config:
-        @staticmethod
-        def alias_generator(key: str):
-            return key.replace("__", ".")
+    model_config = ConfigDict(alias_generator=_dotted_alias)
 
 
 class ServerGlobalConfig(BaseModel):
@@ -174,10 +178,7 @@ class ServerGlobalConfig(BaseModel):
     launch_option__enable_screen: bool = Field(False, description="GNU Screen を使って起動する")
     shutdown_timeout: int = Field(30, description="停止処理の最大待ち時間 (単位: 秒)")
 
-    class Config:
-        @staticmethod
-        def alias_generator(key: str):
-            return key.replace("__", ".")
+    model_config = ConfigDict(alias_generator=_dotted_alias)
 
 
 class FileInfo(BaseModel):
@@ -202,17 +203,18 @@ class FileOperationResult(BaseModel):
     task_id: int | None
     file: FileInfo | None
 
+    # 結果は内部で生成されたものなので検証を省略する
     @classmethod
     def success(cls, task_id: int | None, file: FileInfo | None):
-        return cls(result=fabc.FileTaskResult.SUCCESS, task_id=task_id, file=file)
+        return cls.model_construct(result=fabc.FileTaskResult.SUCCESS, task_id=task_id, file=file)
 
     @classmethod
     def pending(cls, task_id: int | None, file: FileInfo = None):
-        return cls(result=fabc.FileTaskResult.PENDING, task_id=task_id, file=file)
+        return cls.model_construct(result=fabc.FileTaskResult.PENDING, task_id=task_id, file=file)
 
     @classmethod
     def failed(cls, task_id: int | None, file: FileInfo = None):
-        return cls(result=fabc.FileTaskResult.FAILED, task_id=task_id, file=file)
+        return cls.model_construct(result=fabc.FileTaskResult.FAILED, task_id=task_id, file=file)
 
 
 class FileTask(BaseModel):
@@ -226,9 +228,10 @@ class FileTask(BaseModel):
 
     @classmethod
     def create(cls, task: "fabc.FileTask | fabc.BackupTask"):
+        # タスクの値は内部で生成されたものなので検証を省略する
         if isinstance(task, fabc.BackupTask):
             return BackupTask.create(task)
-        return cls(
+        return cls.model_construct(
             id=task.id,
             type=task.type,
             progress=task.progress,
@@ -246,7 +249,7 @@ class BackupTask(FileTask):
 
     @classmethod
     def create(cls, task: "fabc.BackupTask"):
-        return cls(
+        return cls.model_construct(
             id=task.id,
             type=task.type,
             progress=task.progress,
@@ -269,7 +272,8 @@ class ArchiveFile(BaseModel):
 
     @classmethod
     def create(cls, archive_file: "aabc.ArchiveFile"):
-        return cls(
+        # アーカイブヘルパーが生成した値なので検証を省略する
+        return cls.model_construct(
             filename=archive_file.filename,
             is_dir=archive_file.is_dir,
             size=archive_file.size,
@@ -293,7 +297,8 @@ class User(BaseModel):
 
     @classmethod
     def create(cls, user: "db.User"):
-        return cls(
+        # 値はデータベースから取得したものなので検証を省略する
+        return cls.model_construct(
             id=user.id,
             name=user.name,
             last_login=user.last_login,
@@ -308,11 +313,11 @@ class UserOperationResult(BaseModel):
 
     @classmethod
     def success(cls, user_id: int):
-        return cls(result=True, user_id=user_id)
+        return cls.model_construct(result=True, user_id=user_id)
 
     @classmethod
     def failed(cls, user_id: int):
-        return cls(result=False, user_id=user_id)
+        return cls.model_construct(result=False, user_id=user_id)
 
 
 class JarDLVersionInfo(BaseModel):
@@ -330,6 +335,24 @@ class JarDLBuildInfo(BaseModel):
     is_require_build: bool
     is_loaded_info: bool
 
+    @classmethod
+    def create(cls, build: "ServerBuild"):
+        return cls(
+            build=build.build,
+            download_url=build.download_url,
+            java_major_version=build.java_major_version,
+            require_jdk=build.require_jdk,
+            updated_datetime=build.updated_datetime,
+            recommended=build.recommended,
+            is_require_build=build.is_require_build(),
+            is_loaded_info=build.is_loaded_info(),
+        )
+
+
+class JarDLVersionBuildsInfo(BaseModel):
+    version: str = Field(description="対応バージョン。通常は Minecraft バージョンです。")
+    builds: list[JarDLBuildInfo] | None = Field(description="ビルドの一覧。取得に失敗した場合は null")
+
 
 class PluginEditableFile(BaseModel):
     key: str
@@ -346,13 +369,13 @@ class PluginInfo(BaseModel):
 
     @classmethod
     def create(cls, info: "ExtensionInfo", editable_files: "list[EditableFile]"):
-        return cls(
+        return cls.model_construct(
             name=info.name,
             version=info.version,
             description=info.description,
             authors=info.authors,
             editable_files=[
-                PluginEditableFile(key=file.key, label=file.label)
+                PluginEditableFile.model_construct(key=file.key, label=file.label)
                 for file in editable_files
             ],
         )
@@ -365,7 +388,7 @@ class PluginMessageResponse(BaseModel):
 
 
 class JavaExecutableInfo(BaseModel):
-    path: Path
+    path: str
     runtime_version: str
     java_home_path: str | None
     java_major_version: int
@@ -378,7 +401,7 @@ class JavaExecutableInfo(BaseModel):
     @classmethod
     def create(cls, info: abc.JavaExecutableInfo):
         return cls(
-            path=info.path,
+            path=str(info.path),
             runtime_version=info.runtime_version,
             java_home_path=info.java_home_path,
             java_major_version=info.java_major_version,
@@ -420,7 +443,8 @@ class Backup(BaseModel):
 
     @classmethod
     def create(cls, backup: "db.Backup"):
-        return cls(
+        # 値はデータベースから取得したものなので検証を省略する
+        return cls.model_construct(
             id=backup.id,
             type=backup.type,
             source=backup.source,
@@ -442,7 +466,7 @@ class BackupFileInfo(BaseModel):
 
     @classmethod
     def create(cls, info: fbabc.FileInfo):
-        return cls(
+        return cls.model_construct(
             size=info.size,
             modify_time=info.modified_datetime,
             is_dir=info.is_dir,
@@ -457,7 +481,7 @@ class BackupFileDifference(BaseModel):
 
     @classmethod
     def create(cls, diff: fbabc.FileDifference):
-        return cls(
+        return cls.model_construct(
             path=diff.path,
             old_info=BackupFileInfo.create(i) if (i := diff.old_info) else None,
             new_info=BackupFileInfo.create(i) if (i := diff.new_info) else None,
@@ -473,7 +497,7 @@ class BackupFilePathInfo(BaseModel):
 
     @classmethod
     def create(cls, path: str, info: fbabc.FileInfo):
-        return cls(
+        return cls.model_construct(
             size=info.size,
             modify_time=info.modified_datetime,
             is_dir=info.is_dir,
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import mimetypes
 from urllib.parse import quote
 
@@ -46,9 +47,28 @@ class FallbackStaticFiles(StaticFiles):
             raise
 
 
+@functools.lru_cache(maxsize=256)
+def _guess_media_type_by_ext(ext: str) -> str | None:
+    return mimetypes.guess_type("_" + ext)[0]
+
+
+def guess_media_type(filename: str) -> str | None:
+    """
+    ファイル名からメディアタイプを推測します
+
+    :func:`mimetypes.guess_type` は末尾の拡張子 (圧縮形式の場合は1つ前まで) のみを参照するため、
+    その拡張子ごとに結果をキャッシュします
+    """
+    parts = filename.rsplit(".", 2)
+    ext = "." + parts[-1] if len(parts) > 1 else ""
+    if len(parts) > 2 and ext in mimetypes.encodings_map:
+        ext = "." + parts[-2] + ext
+    return _guess_media_type_by_ext(ext)
+
+
 class StreamingResponse(_StreamingResponse):
     def __init__(self, content: ContentStream, filename: str, headers: dict[str, str] = None):
-        media_type = mimetypes.guess_type(filename)[0] or None
+        media_type = guess_media_type(filename)
         headers = headers or {}
         self.set_attached_file_header(headers, filename)
         super().__init__(content, headers=headers, media_type=media_type)
@@ -57,7 +77,7 @@ class StreamingResponse(_StreamingResponse):
     def set_attached_file_header(headers: dict[str, str], filename: str):
         content_disposition_filename = quote(filename)
         if content_disposition_filename != filename:
-            content_disposition = "attachment; filename*=utf-8''{}".format(content_disposition_filename)
+            content_disposition = f"attachment; filename*=utf-8''{content_disposition_filename}"
         else:
-            content_disposition = 'attachment; filename="{}"'.format(filename)
+            content_disposition = f'attachment; filename="{filename}"'
         headers.setdefault("content-disposition", content_disposition)
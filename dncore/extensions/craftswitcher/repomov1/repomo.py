@@ -1,5 +1,6 @@
 import asyncio
 from logging import getLogger
+from typing import Any, Awaitable, Callable
 
 from . import errors
 from .socket_data import *
@@ -61,10 +62,8 @@ class ServerStatusUpdater(object):
         self._interrupted = True
         if self._task:
             self._task.cancel()
-            try:
-                await self._task
-            except (Exception, ):
-                pass
+            # タスクの CancelledError を呼び出し元に伝えずに終了を待つ
+            await asyncio.wait((self._task, ))
         self._task = None
 
 
@@ -72,6 +71,15 @@ class ReportModuleServer(TCPClientListener):
     def __init__(self, loop: asyncio.AbstractEventLoop):
         self.tcp = TCPServer("localhost", 8023, loop)
         self.server_updaters = {}  # type: dict[str, ServerStatusUpdater]
+        # 受信データの型 -> ハンドラ
+        self._data_handlers = {
+            ServerStartRequest: self._on_server_start_request,
+            ServerStopRequest: self._on_server_stop_request,
+            ServerRestartRequest: self._on_server_restart_request,
+            ServerListRequest: self._on_server_list_request,
+            ServerChangeStateData: self._on_server_change_state,
+            ServerStateRequest: self._on_server_state_request,
+        }  # type: dict[type[SerializableData], Callable[[str, Any], Awaitable[SerializableData]]]
         #
         self.tcp.add_listener(self)
 
@@ -91,8 +99,11 @@ class ReportModuleServer(TCPClientListener):
         await self.tcp.start()
 
     async def close(self):
-        for updater in self.server_updaters.values():
-            await updater.stop()
+        if self.server_updaters:
+            await asyncio.gather(
+                *(updater.stop() for updater in self.server_updaters.values()),
+                return_exceptions=True,
+            )
         self.server_updaters.clear()
 
         await self.tcp.close()
@@ -122,124 +133,140 @@ class ReportModuleServer(TCPClientListener):
         await updater.stop()
 
     async def on_receive_data(self, reporter_name: str, data: SerializableData, data_id: int) -> SerializableData:
-        sender_server = self.servers.get(reporter_name)
+        try:
+            handler = self._data_handlers[type(data)]
+        except KeyError:
+            log.debug(f"onReceive: reporter=" + reporter_name + ", class=" + type(data).__name__)
+            return
 
-        if isinstance(data, ServerStartRequest):
-            target_server = data.target_server
-            server = self.servers.get(target_server)
-            response = ServerStartRequest()
-            if server:
-                response.target_server = server.id
+        return await handler(reporter_name, data)
 
-            if not server:
-                response.success = False
-                response.fail_message = "not found server"
+    async def _on_server_start_request(self, _reporter_name: str, data: ServerStartRequest):
+        target_server = data.target_server
+        server = self.servers.get(target_server)
+        response = ServerStartRequest()
+        if server:
+            response.target_server = server.id
+
+        if not server:
+            response.success = False
+            response.fail_message = "not found server"
+
+        elif server.state.is_running:
+            response.success = False
+            response.fail_message = "already running server"
 
-            elif server.state.is_running:
+        else:
+            try:
+                await server.start()
+
+            except errors.ServerProcessError as e:
                 response.success = False
-                response.fail_message = "already running server"
+                response.fail_message = errors.localize(e)
 
             else:
-                try:
-                    await server.start()
+                response.success = True
+        return response
 
-                except errors.ServerProcessError as e:
-                    response.success = False
-                    response.fail_message = errors.localize(e)
+    async def _on_server_stop_request(self, _reporter_name: str, data: ServerStopRequest):
+        target_server = data.target_server
+        server = self.servers.get(target_server)
+        response = ServerStopRequest()
+        if server:
+            response.target_server = server.id
 
-                else:
-                    response.success = True
-            return response
+        if not server:
+            response.success = False
+            response.fail_message = "not found server"
 
-        elif isinstance(data, ServerStopRequest):
-            target_server = data.target_server
-            server = self.servers.get(target_server)
-            response = ServerStopRequest()
-            if server:
-                response.target_server = server.id
+        elif not server.state.is_running:
+            response.success = False
+            response.fail_message = "already stopped server"
 
-            if not server:
-                response.success = False
-                response.fail_message = "not found server"
+        else:
+            try:
+                await server.stop()
+                await server.wait_for_shutdown()
 
-            elif not server.state.is_running:
+            except asyncio.TimeoutError:
+                response.success = False
+                response.fail_message = "timeout stopping"
+            except errors.ServerProcessError as e:
                 response.success = False
-                response.fail_message = "already stopped server"
+                response.fail_message = errors.localize(e)
 
             else:
-                try:
-                    await server.stop()
-                    await server.wait_for_shutdown()
+                response.success = True
+        return response
 
-                except asyncio.TimeoutError:
-                    response.success = False
-                    response.fail_message = "timeout stopping"
-                except errors.ServerProcessError as e:
-                    response.success = False
-                    response.fail_message = errors.localize(e)
+    async def _on_server_restart_request(self, _reporter_name: str, data: ServerRestartRequest):
+        target_server = data.target_server
+        server = self.servers.get(target_server)
+        response = ServerRestartRequest()
+        if server:
+            response.target_server = server.id
 
-                else:
-                    response.success = True
-            return response
+        if not server:
+            response.success = False
+            response.fail_message = "not found server"
 
-        elif isinstance(data, ServerRestartRequest):
-            target_server = data.target_server
-            server = self.servers.get(target_server)
-            response = ServerRestartRequest()
-            if server:
-                response.target_server = server.id
+        elif not server.state.is_running:
+            response.success = False
+            response.fail_message = "stopped server"
 
-            if not server:
-                response.success = False
-                response.fail_message = "not found server"
+        else:
+            try:
+                await server.stop()
+                await server.wait_for_shutdown()
+                await server.start()
 
-            elif not server.state.is_running:
+            except asyncio.TimeoutError:
                 response.success = False
-                response.fail_message = "stopped server"
+                response.fail_message = "timeout stopping"
+            except errors.ServerProcessingError:
+                response.success = False
+                response.fail_message = "processing"
+            except errors.ServerProcessError as e:
+                response.success = False
+                response.fail_message = errors.localize(e)
 
             else:
-                try:
-                    await server.stop()
-                    await server.wait_for_shutdown()
-                    await server.start()
-
-                except asyncio.TimeoutError:
-                    response.success = False
-                    response.fail_message = "timeout stopping"
-                except errors.ServerProcessingError:
-                    response.success = False
-                    response.fail_message = "processing"
-                except errors.ServerProcessError as e:
-                    response.success = False
-                    response.fail_message = errors.localize(e)
-
-                else:
-                    response.success = True
-            return response
-
-        elif isinstance(data, ServerListRequest):
-            response = ServerListRequest()
-            response.servers = [k for k, v in self.servers.items() if v]
-            return response
+                response.success = True
+        return response
 
-        elif isinstance(data, ServerChangeStateData):
-            state = ServerState.of_old_value(data.state)
+    async def _on_server_list_request(self, _reporter_name: str, _data: ServerListRequest):
+        response = ServerListRequest()
+        response.servers = [k for k, v in self.servers.items() if v is not None]
+        return response
 
-            if sender_server:
-                sender_server.state = state
+    async def _on_server_change_state(self, reporter_name: str, data: ServerChangeStateData):
+        state = ServerState.of_old_value(data.state)
 
-            return EmptyResponseData()
+        if sender_server := self.servers.get(reporter_name):
+            sender_server.state = state
 
-        elif isinstance(data, ServerStateRequest):
-            if server := self.servers.get(data.server):
-                return ServerStateRequest(server.id, server.state.old_value)
-            return EmptyResponseData()
+        return EmptyResponseData()
 
-        log.debug(f"onReceive: reporter=" + reporter_name + ", class=" + type(data).__name__)
+    async def _on_server_state_request(self, _reporter_name: str, data: ServerStateRequest):
+        if server := self.servers.get(data.server):
+            return ServerStateRequest(server.id, server.state.old_value)
+        return EmptyResponseData()
 
     async def send_to_all(self, data: SerializableData):
-        for reporter_name in self.server_updaters.keys():
-            asyncio.get_running_loop().create_task(self.tcp.send_data(reporter_name, data))
+        if self.server_updaters:
+            # 応答は待たずに、まとめて送信するタスクを1つだけ作成する
+            asyncio.get_running_loop().create_task(self._send_to_all(data, list(self.server_updaters)))
+
+    async def _send_to_all(self, data: SerializableData, reporter_names: list[str]):
+        results = await asyncio.gather(
+            *(self.tcp.send_data(reporter_name, data) for reporter_name in reporter_names),
+            return_exceptions=True,
+        )
+        for reporter_name, result in zip(reporter_names, results):
+            if isinstance(result, (KeyError, ConnectionError, errors.ClosedError)):
+                log.debug("Failed to send %s to %s: disconnected", type(data).__name__, reporter_name)
+            elif isinstance(result, BaseException):
+                log.warning("Failed to send %s to %s: %s", type(data).__name__, reporter_name, str(result))
 
     async def handle_on_server_add(self, server_id: str):
         await self.send_to_all(ServerAddData(server_id))
@@ -159,7 +159,8 @@ class TCPServer(object):
 
             try:
                 for future in self._send_futures.get(writer, {}).values():
-                    future.set_exception(ClosedError())
+                    if not future.done():
+                        future.set_exception(ClosedError())
             finally:
                 if writer in self._writers.values():
                     self._writers.pop(reporter_name, None)
@@ -181,11 +182,14 @@ class TCPServer(object):
         self._send_data_id[writer] = data_id
 
         future = asyncio.Future()
-        self._send_futures.setdefault(writer, {})[data_id] = future
-
-        await self.send_raw_data("send", writer, data, data_id)
-        await future
-        return future.result()
+        futures = self._send_futures.setdefault(writer, {})
+        futures[data_id] = future
+        try:
+            await self.send_raw_data("send", writer, data, data_id)
+            return await future
+        finally:
+            # タイムアウト等で待機が中断されても、応答待ちとして残さない
+            futures.pop(data_id, None)
 
     @staticmethod
     async def send_raw_data(method: str, writer: StreamWriter, data: SerializableData, data_id: int):
@@ -168,6 +168,7 @@ class ServerProcess(object):
         self.log = ServerLoggerAdapter(_log, server_id)
         self.loop = loop
         self._directory = directory
+        self._resolved_directory = None  # type: Path | None
         self.id = server_id
         self._config = config
         self.config = ServerProcess.Config(config, global_config)
@@ -194,6 +195,18 @@ class ServerProcess(object):
         if self._directory != new_dir:
             self.log.debug("Update directory: %s -> %s", self._directory, new_dir)
         self._directory = new_dir
+        self._resolved_directory = None
+
+    @property
+    def resolved_directory(self) -> Path:
+        """
+        解決済みのサーバーディレクトリを返します
+
+        値は directory が変更されるまでキャッシュされます
+        """
+        if self._resolved_directory is None:
+            self._resolved_directory = self._directory.resolve()
+        return self._resolved_directory
 
     @property
     def builder(self):
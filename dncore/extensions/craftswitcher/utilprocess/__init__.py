@@ -10,6 +10,7 @@ log = getLogger(__name__)
 __all__ = [
     "ProcessWrapper",
     "PtyProcessWrapper",
+    "setup_child_watcher",
 ]
 
 
@@ -56,6 +57,39 @@ class ProcessWrapper:
         os.kill(self.pid, sig)
 
 
+def setup_child_watcher(loop: asyncio.AbstractEventLoop) -> bool:
+    """
+    pidfd (Linux 5.3 以降) が使える場合、子プロセスの終了待ちに PidfdChildWatcher を使うように設定します
+
+    Python 3.12 以降は標準で pidfd が使われるため、何もしません
+
+    :arg loop: 子プロセスを起動するイベントループ
+    :return: 設定した場合は True
+    """
+    if sys.platform != "linux" or sys.version_info >= (3, 12) or not hasattr(os, "pidfd_open"):
+        return False
+
+    # uvloop などの独自のイベントループは、子プロセスを自前で監視する
+    if not isinstance(asyncio.get_event_loop_policy(), asyncio.DefaultEventLoopPolicy):
+        return False
+
+    # noinspection PyDeprecation
+    if isinstance(asyncio.get_child_watcher(), asyncio.PidfdChildWatcher):
+        return True
+
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except OSError:
+        return False
+
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(loop)
+    # noinspection PyDeprecation
+    asyncio.set_child_watcher(watcher)
+    log.debug("Using PidfdChildWatcher")
+    return True
+
+
 if sys.platform == "win32":
     from ._win import WinPtyProcessWrapper as PtyProcessWrapper
 else:
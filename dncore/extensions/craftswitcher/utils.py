@@ -4,6 +4,7 @@ import functools
 import locale
 import logging
 import platform
+import time
 import uuid
 from collections import deque
 from logging import getLogger
@@ -28,6 +29,7 @@ __all__ = [
     "system_memory",
     "system_perf",
     "disk_usage",
+    "disk_usage_cached",
     "datetime_now",
     "safe_server_id",
     "generate_uuid",
@@ -70,6 +72,31 @@ def disk_usage(path: str | Path):
     return DiskUsageInfo(info.total, info.used, info.free)
 
 
+_disk_usage_cache = {}  # type: dict[str, tuple[float, DiskUsageInfo]]
+
+
+def disk_usage_cached(path: str | Path, max_age: float = 2.0):
+    """
+    max_age 秒以内に取得した値があれば、それを返します
+    """
+    path = str(path)
+    now = time.monotonic()
+    try:
+        cached_time, info = _disk_usage_cache[path]
+    except KeyError:
+        pass
+    else:
+        if now - cached_time < max_age:
+            return info
+
+    info = disk_usage(path)
+    for _path, (cached_time, _) in list(_disk_usage_cache.items()):
+        if max_age <= now - cached_time:
+            _disk_usage_cache.pop(_path, None)
+    _disk_usage_cache[path] = now, info
+    return info
+
+
 def datetime_now():
     return datetime.datetime.now(datetime.timezone.utc)
 